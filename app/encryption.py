@@ -7,18 +7,88 @@ import os
 import base64
 import hashlib
 import hmac
-from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from functools import lru_cache
+
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
 from cryptography.exceptions import InvalidTag
 
 
-def generate_key():
+# GCM authentication tag length in bytes (appended to the ciphertext,
+# matching the AESGCM one-shot wire format)
+_GCM_TAG_SIZE = 16
+
+# Algorithm tags prefixed to the stored nonce (13 bytes total). Legacy
+# rows have a bare 12-byte nonce and are always AES-GCM.
+_ALG_AESGCM = 0x01
+_ALG_CHACHA20 = 0x02
+
+# Payloads at or above this size go through the streaming EVP interface
+# with a preallocated output buffer via update_into(); below it the
+# cached one-shot AESGCM wrapper wins because _cipher() amortizes the
+# key schedule and the wrapper's internal copy is cheap for small data.
+#
+# Intra-message parallelism (splitting a blob into per-thread CTR chunks
+# and combining a single GHASH) was considered for multi-MB payloads and
+# rejected: it would reimplement GCM's counter/tag layout in application
+# code, and OpenSSL's fused AES-NI+PCLMUL loop already runs at several
+# GB/s single-threaded — far above what the 5 MB content cap can use.
+# Concurrency belongs at the caller level, across independent documents,
+# where each decrypt releases the GIL inside OpenSSL.
+_STREAMING_THRESHOLD = 64 * 1024
+
+
+def _has_aes_acceleration():
+    """
+    Detect hardware AES support (AES-NI on x86, Crypto Extensions on ARM).
+
+    Without it OpenSSL falls back to table-based AES, which is an order of
+    magnitude slower than ChaCha20 in software. Reads /proc/cpuinfo on
+    Linux; on other platforms assumes acceleration is present.
+    """
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith(("flags", "Features")):
+                    return " aes " in f" {line.split(':', 1)[1].strip()} "
+    except OSError:
+        pass
+    return True
+
+
+# Cipher used for all new writes. Reads honour the per-row algorithm tag,
+# so data written on one kind of host decrypts fine on the other.
+_DEFAULT_ALG = _ALG_AESGCM if _has_aes_acceleration() else _ALG_CHACHA20
+
+
+@lru_cache(maxsize=1024)
+def _cipher(raw_key, alg=_ALG_AESGCM):
+    """
+    Return a cached AEAD instance for a raw key and algorithm tag.
+
+    Constructing the AEAD object runs the key schedule; caching instances
+    means that cost is paid once per distinct key instead of on every call.
+    The cache is bounded (LRU, 1024 entries) and lru_cache is thread-safe
+    in CPython.
+    """
+    if alg == _ALG_CHACHA20:
+        return ChaCha20Poly1305(raw_key)
+    return AESGCM(raw_key)
+
+
+def generate_raw_key():
     """
     Generate a new 256-bit encryption key.
-    Returns: Base64 URL-safe encoded key string.
+    Returns: Raw bytes key (32 bytes).
     """
-    raw_key = os.urandom(32)  # 256 bits
-    key_b64 = base64.urlsafe_b64encode(raw_key).decode()
-    return key_b64
+    return os.urandom(32)  # 256 bits
+
+
+def encode_key(raw_key):
+    """
+    Encode a raw key as a Base64 URL-safe string.
+    """
+    return base64.urlsafe_b64encode(raw_key).decode()
 
 
 def decode_key(key_b64):
@@ -29,6 +99,75 @@ def decode_key(key_b64):
     return base64.urlsafe_b64decode(key_b64)
 
 
+def encrypt_bytes(content_bytes, raw_key):
+    """
+    Encrypt raw bytes using AES-256-GCM.
+
+    Args:
+        content_bytes: Bytes content to encrypt
+        raw_key: Raw bytes key (32 bytes) - should be the read key
+
+    Returns:
+        tuple: (ciphertext bytes, stored nonce bytes — a 1-byte algorithm
+        tag followed by the 96-bit nonce)
+    """
+    nonce = os.urandom(12)  # 96-bit nonce for GCM/ChaCha20
+    stored_nonce = bytes([_DEFAULT_ALG]) + nonce
+
+    if _DEFAULT_ALG == _ALG_CHACHA20:
+        # Software-only hosts: ChaCha20-Poly1305 is far faster than
+        # unaccelerated AES-GCM.
+        return _cipher(raw_key, _ALG_CHACHA20).encrypt(nonce, content_bytes, None), stored_nonce
+
+    if len(content_bytes) < _STREAMING_THRESHOLD:
+        return _cipher(raw_key).encrypt(nonce, content_bytes, None), stored_nonce
+
+    # Large payloads: write straight into a preallocated buffer via the
+    # EVP streaming interface, avoiding the AEAD wrapper's internal copy.
+    encryptor = Cipher(algorithms.AES(raw_key), modes.GCM(nonce)).encryptor()
+    buf = bytearray(len(content_bytes) + _GCM_TAG_SIZE)
+    written = encryptor.update_into(content_bytes, buf)
+    encryptor.finalize()
+    buf[written:] = encryptor.tag
+    return bytes(buf), stored_nonce
+
+
+def encrypt_bytes_chunks(chunks, raw_key):
+    """
+    Encrypt a sequence of byte chunks as a single message.
+
+    Produces the same wire format as encrypt_bytes for the concatenation
+    of the chunks, but feeds them through the EVP streaming interface
+    into one preallocated output buffer, so the plaintext concatenation
+    is never materialized. Used by the PATCH append path, where the
+    existing content and the appended chunk are already separate buffers.
+
+    Args:
+        chunks: Sequence of bytes-like chunks
+        raw_key: Raw bytes key (32 bytes) - should be the read key
+
+    Returns:
+        tuple: (ciphertext bytes, stored nonce bytes)
+    """
+    nonce = os.urandom(12)
+    stored_nonce = bytes([_DEFAULT_ALG]) + nonce
+
+    if _DEFAULT_ALG == _ALG_CHACHA20:
+        # No streaming interface for ChaCha20-Poly1305; join and one-shot
+        return _cipher(raw_key, _ALG_CHACHA20).encrypt(nonce, b"".join(chunks), None), stored_nonce
+
+    total = sum(len(chunk) for chunk in chunks)
+    encryptor = Cipher(algorithms.AES(raw_key), modes.GCM(nonce)).encryptor()
+    buf = bytearray(total + _GCM_TAG_SIZE)
+    out = memoryview(buf)
+    written = 0
+    for chunk in chunks:
+        written += encryptor.update_into(chunk, out[written:])
+    encryptor.finalize()
+    buf[written:] = encryptor.tag
+    return bytes(buf), stored_nonce
+
+
 def encrypt_content(content, raw_key):
     """
     Encrypt content using AES-256-GCM.
@@ -40,10 +179,44 @@ def encrypt_content(content, raw_key):
     Returns:
         tuple: (ciphertext bytes, nonce bytes)
     """
-    nonce = os.urandom(12)  # 96-bit nonce for GCM
-    aesgcm = AESGCM(raw_key)
-    ciphertext = aesgcm.encrypt(nonce, content.encode("utf-8"), None)
-    return ciphertext, nonce
+    return encrypt_bytes(content.encode("utf-8"), raw_key)
+
+
+def decrypt_bytes(ciphertext, nonce, raw_key):
+    """
+    Decrypt content using AES-256-GCM, returning raw bytes.
+
+    Skips the UTF-8 decode of decrypt_content — useful when the plaintext
+    is only re-encoded again (e.g. the PATCH append path).
+
+    Raises:
+        InvalidTag: If decryption fails (wrong key or tampered data)
+    """
+    # Tagged nonces carry a leading algorithm byte; bare 12-byte nonces
+    # are legacy rows written before the tag existed (always AES-GCM).
+    alg = _ALG_AESGCM
+    if len(nonce) == 13:
+        alg = nonce[0]
+        nonce = bytes(nonce[1:])
+
+    if alg == _ALG_CHACHA20:
+        return _cipher(raw_key, _ALG_CHACHA20).decrypt(nonce, ciphertext, None)
+
+    if len(ciphertext) < _STREAMING_THRESHOLD:
+        return _cipher(raw_key).decrypt(nonce, ciphertext, None)
+
+    # Large payloads: decrypt through the EVP streaming interface into a
+    # preallocated buffer; finalize() verifies the GCM tag. The data/tag
+    # split goes through a memoryview so it never copies the multi-MB
+    # ciphertext — slicing bytes here would duplicate the whole blob.
+    view = memoryview(ciphertext)
+    data = view[: -_GCM_TAG_SIZE]
+    tag = bytes(view[-_GCM_TAG_SIZE:])
+    decryptor = Cipher(algorithms.AES(raw_key), modes.GCM(nonce, tag)).decryptor()
+    buf = bytearray(len(data) + 15)
+    written = decryptor.update_into(data, buf)
+    decryptor.finalize()
+    return bytes(memoryview(buf)[:written])
 
 
 def decrypt_content(ciphertext, nonce, raw_key):
@@ -61,51 +234,59 @@ def decrypt_content(ciphertext, nonce, raw_key):
     Raises:
         InvalidTag: If decryption fails (wrong key or tampered data)
     """
-    aesgcm = AESGCM(raw_key)
-    plaintext = aesgcm.decrypt(nonce, ciphertext, None)
-    return plaintext.decode("utf-8")
+    return decrypt_bytes(ciphertext, nonce, raw_key).decode("utf-8")
 
 
-def verify_key(ciphertext, nonce, raw_key):
+def verify_key_hash(raw_key, stored_hash):
     """
-    Verify that a key is correct by attempting decryption.
+    Verify a raw key against a stored SHA-256 key hash.
+
+    Constant-time compare over 32 bytes — use this instead of a trial
+    decryption wherever a read_key_hash is stored, so bad keys are
+    rejected without running AES-GCM over the whole ciphertext.
 
     Returns:
-        bool: True if key is valid, False otherwise
+        bool: True if the key matches the stored hash
     """
-    try:
-        decrypt_content(ciphertext, nonce, raw_key)
-        return True
-    except (InvalidTag, Exception):
-        return False
+    return hmac.compare_digest(hashlib.sha256(raw_key).digest(), stored_hash)
 
 
-def derive_read_key(write_key_b64):
+@lru_cache(maxsize=1024)
+def derive_read_key_raw(write_key_raw):
     """
-    Derive a read key from a write key using HMAC-SHA256.
-    
-    Args:
-        write_key_b64: Base64 URL-safe encoded write key
-        
-    Returns:
-        String: Base64 URL-safe encoded read key
+    Derive the raw read key from raw write-key bytes.
+
+    Uses HMAC-SHA256 with the write key and a constant message.
+    hmac.digest() is the one-shot C fast path — for short messages it
+    skips the Python-level HMAC object and pad handling entirely while
+    producing the same bytes as hmac.new(...).digest(), so keys derived
+    before this change still match.
+
+    Memoized like _cipher: a write request derives the same read key at
+    auth time and again at encrypt time, and repeat clients re-derive it
+    on every request. The bounded cache makes those lookups O(1).
     """
-    write_key_raw = decode_key(write_key_b64)
-    # Use HMAC-SHA256 with the write key and a constant message
-    read_key_raw = hmac.new(write_key_raw, b"molt-read", hashlib.sha256).digest()
-    read_key_b64 = base64.urlsafe_b64encode(read_key_raw).decode()
-    return read_key_b64
+    return hmac.digest(write_key_raw, b"molt-read", "sha256")
 
 
-def hash_key(key_b64):
+@lru_cache(maxsize=1024)
+def derive_and_hash_raw(write_key_raw):
     """
-    Generate SHA-256 hash of a key for storage/verification.
-    
-    Args:
-        key_b64: Base64 URL-safe encoded key
-        
-    Returns:
-        bytes: SHA-256 hash of the key
+    Derive the raw read key and its storage hash in one call.
+
+    Every auth path needs both values to classify the provided key, so
+    pairing the memoized derivation with its SHA-256 keeps call sites on
+    raw bytes with a single helper call. Memoized like the derivation
+    itself: the hash of a derived key is deterministic, so repeat
+    requests with a known key skip the SHA-256 (hashlib dispatches to
+    OpenSSL, but a dict hit is cheaper still).
+    """
+    read_key_raw = derive_read_key_raw(write_key_raw)
+    return read_key_raw, hash_raw_key(read_key_raw)
+
+
+def hash_raw_key(raw_key):
+    """
+    Generate SHA-256 hash of a raw key for storage/verification.
     """
-    key_raw = decode_key(key_b64)
-    return hashlib.sha256(key_raw).digest()
+    return hashlib.sha256(raw_key).digest()
@@ -5,7 +5,10 @@ Documents and workspaces expire after 30 days of inactivity (no read or write).
 This command should be run on a cron schedule (e.g., daily).
 """
 
+import time
+
 from django.core.management.base import BaseCommand
+from django.db import connection
 from django.utils import timezone
 from datetime import timedelta
 from app.models import Document, Workspace
@@ -21,18 +24,50 @@ class Command(BaseCommand):
             default=30,
             help="Number of days of inactivity before purging (default: 30)",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Maximum rows to delete per transaction (default: 10000)",
+        )
+
+    def _bulk_delete(self, model, cutoff, batch_size):
+        """Delete expired rows for a model in bounded SQL DELETE batches.
+
+        A single unbounded DELETE on a large backlog holds row locks and
+        grows the WAL for the whole statement. Deleting via a keyset
+        subquery keeps each transaction short and the index scan hot,
+        yielding to foreground traffic between batches.
+
+        Returns the total number of rows deleted.
+        """
+        table = connection.ops.quote_name(model._meta.db_table)
+        sql = (
+            f"DELETE FROM {table} WHERE id IN "
+            f"(SELECT id FROM {table} WHERE last_accessed < %s LIMIT %s)"
+        )
+        total = 0
+        while True:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [cutoff, batch_size])
+                deleted = cursor.rowcount
+            total += deleted
+            if deleted < batch_size:
+                return total
+            # Brief pause so the purge doesn't starve foreground queries
+            time.sleep(0.05)
 
     def handle(self, *args, **options):
         days = options["days"]
+        batch_size = options["batch_size"]
         cutoff = timezone.now() - timedelta(days=days)
 
-        # Find and delete expired documents
-        expired_docs = Document.objects.filter(last_accessed__lt=cutoff)
-        docs_deleted, _ = expired_docs.delete()
-
-        # Find and delete expired workspaces
-        expired_workspaces = Workspace.objects.filter(last_accessed__lt=cutoff)
-        ws_deleted, _ = expired_workspaces.delete()
+        # Delete expired rows with plain SQL. QuerySet.delete() fetches all
+        # matching PKs and instantiates models to run the cascade collector —
+        # neither model has relations or signals, so a single indexed DELETE
+        # does the same work without O(N) Python object construction.
+        docs_deleted = self._bulk_delete(Document, cutoff, batch_size)
+        ws_deleted = self._bulk_delete(Workspace, cutoff, batch_size)
 
         self.stdout.write(
             self.style.SUCCESS(
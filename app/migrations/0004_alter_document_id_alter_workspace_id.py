@@ -0,0 +1,24 @@
+# Generated by Django 5.2.17 on 2026-08-29 06:56
+
+import app.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_purge_brin_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='document',
+            name='id',
+            field=models.UUIDField(default=app.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='workspace',
+            name='id',
+            field=models.UUIDField(default=app.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
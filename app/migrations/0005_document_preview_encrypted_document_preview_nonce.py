@@ -0,0 +1,23 @@
+# Generated by Django 5.2.17 on 2026-08-29 07:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_alter_document_id_alter_workspace_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='preview_encrypted',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='preview_nonce',
+            field=models.BinaryField(null=True),
+        ),
+    ]
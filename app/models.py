@@ -1,12 +1,36 @@
 from django.db import models
+import os
+import time
 import uuid
 
 
+def uuid7():
+    """
+    Generate a time-ordered UUIDv7 (RFC 9562).
+
+    Unlike uuid4, the leading 48 bits are a unix-millisecond timestamp, so
+    primary keys sort by creation time. Inserts append to the right edge of
+    the PK btree instead of dirtying random leaf pages, and the PK index
+    doubles as a creation-time range index.
+    """
+    buf = bytearray(16)
+    buf[0:6] = (time.time_ns() // 1_000_000).to_bytes(6, "big")
+    buf[6:16] = os.urandom(10)
+    buf[6] = (buf[6] & 0x0F) | 0x70  # version 7
+    buf[8] = (buf[8] & 0x3F) | 0x80  # RFC 4122 variant
+    return uuid.UUID(bytes=bytes(buf))
+
+
 class Document(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     content_encrypted = models.BinaryField()  # Encrypted with read key
     nonce = models.BinaryField()
     read_key_hash = models.BinaryField(null=True)  # SHA-256 hash of read key for verification
+    # First ~4 KB of plaintext encrypted separately, so workspace
+    # previews decrypt a bounded prefix instead of the whole blob.
+    # NULL on rows written before the field existed (full-decrypt fallback).
+    preview_encrypted = models.BinaryField(null=True)
+    preview_nonce = models.BinaryField(null=True)
     version = models.IntegerField(default=1)
     last_accessed = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -22,7 +46,7 @@ class Document(models.Model):
 
 
 class Workspace(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     content_encrypted = models.BinaryField()  # Encrypted JSON blob with read key
     nonce = models.BinaryField()
     read_key_hash = models.BinaryField(null=True)  # SHA-256 hash of read key for verification
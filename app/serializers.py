@@ -69,27 +69,3 @@ class WorkspaceCreateSerializer(serializers.Serializer):
 
     name = serializers.CharField()
     entries = serializers.ListField(child=serializers.DictField(), default=list)
-
-
-class WorkspaceCreateResponseSerializer(serializers.Serializer):
-    """Serializer for workspace creation response."""
-
-    id = serializers.UUIDField()
-    write_key = serializers.CharField()
-    read_key = serializers.CharField()
-
-
-class WorkspaceDetailSerializer(serializers.Serializer):
-    """Serializer for detailed workspace responses with decrypted content."""
-
-    id = serializers.UUIDField()
-    name = serializers.CharField()
-    entries = serializers.ListField(child=serializers.DictField())
-    version = serializers.IntegerField()
-
-
-class WorkspaceUpdateResponseSerializer(serializers.Serializer):
-    """Serializer for workspace update response."""
-
-    success = serializers.BooleanField(default=True)
-    version = serializers.IntegerField()
@@ -2,10 +2,83 @@
 Custom throttling classes for molt-md API.
 """
 
-from rest_framework.throttling import AnonRateThrottle
+import threading
+from collections import deque
 
+from rest_framework.throttling import AnonRateThrottle, SimpleRateThrottle
 
-class CreateDocumentThrottle(AnonRateThrottle):
+
+class InProcessRateThrottle(SimpleRateThrottle):
+    """
+    Sliding-window rate throttle kept in process memory.
+
+    SimpleRateThrottle does one cache GET and one cache SET per request,
+    which on a remote cache backend costs a network round-trip each way.
+    This variant keeps the request history in a module-level dict instead,
+    trading cross-worker accuracy (each worker enforces its own window)
+    for zero cache traffic on the request path.
+
+    Rates are parsed from DEFAULT_THROTTLE_RATES by scope, same as
+    SimpleRateThrottle.
+    """
+
+    _lock = threading.Lock()
+    _history = {}  # "scope:ident" -> deque of timestamps, newest first
+    _MAX_TRACKED_KEYS = 10000
+
+    def get_cache_key(self, request, view):
+        return f"{self.scope}:{self.get_ident(request)}"
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        self.now = self.timer()
+
+        with self._lock:
+            if len(self._history) >= self._MAX_TRACKED_KEYS:
+                self._evict_stale()
+
+            history = self._history.setdefault(self.key, deque())
+            # Drop timestamps that have left the window (oldest are last)
+            while history and history[-1] <= self.now - self.duration:
+                history.pop()
+
+            if len(history) >= self.num_requests:
+                self.history = list(history)
+                return self.throttle_failure()
+
+            history.appendleft(self.now)
+            self.history = list(history)
+        return self.throttle_success()
+
+    def throttle_success(self):
+        # The in-process history is already updated under the lock;
+        # nothing to persist to the cache backend.
+        return True
+
+    def _evict_stale(self):
+        """Bound the tracked-identity table. Caller holds _lock.
+
+        Drops identities whose whole window has expired first. If that
+        is not enough — e.g. a client spoofing distinct forwarded
+        addresses within one window — falls back to dropping the least
+        recently seen identities, so _MAX_TRACKED_KEYS is a hard cap
+        rather than a hope.
+        """
+        cutoff = self.timer() - self.duration
+        for key in [k for k, h in self._history.items() if not h or h[0] <= cutoff]:
+            del self._history[key]
+        # Leave room for the identity about to be inserted
+        overflow = len(self._history) - self._MAX_TRACKED_KEYS + 1
+        if overflow > 0:
+            # h[0] is each identity's most recent request
+            for key in sorted(self._history, key=lambda k: self._history[k][0])[:overflow]:
+                del self._history[key]
+
+
+class CreateDocumentThrottle(InProcessRateThrottle):
     """
     Stricter rate limit for document creation to prevent spam.
     Default: 10 requests per minute per IP.
@@ -0,0 +1,80 @@
+"""
+Deferred last_accessed updates for molt-md.
+
+Read handlers record a TTL "touch" here instead of issuing a synchronous
+UPDATE on the request path. A daemon thread drains the queue every
+couple of seconds and coalesces the touches into one bulk UPDATE per
+model, so a burst of reads costs one index write instead of one per GET.
+
+Touches are best-effort: the TTL is approximate (30 days), so losing an
+unflushed batch on process exit only delays an expiry bump by one
+flush interval.
+"""
+
+import logging
+import threading
+
+from django.db import close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background flushes
+FLUSH_INTERVAL = 2.0
+
+_lock = threading.Lock()
+_pending = {}  # model class -> set of pending ids
+_flusher = None
+
+
+def schedule_touch(model, obj_id):
+    """
+    Record a TTL bump for obj_id, to be flushed in the background.
+
+    Args:
+        model: Model class with a last_accessed field
+        obj_id: Primary key of the row to touch
+    """
+    with _lock:
+        _pending.setdefault(model, set()).add(obj_id)
+        _ensure_flusher()
+
+
+def flush():
+    """
+    Drain all pending touches into one bulk UPDATE per model.
+
+    Called periodically by the background thread; safe to call directly
+    (e.g. from tests) for deterministic behaviour.
+    """
+    with _lock:
+        batches = {model: ids for model, ids in _pending.items() if ids}
+        _pending.clear()
+
+    if not batches:
+        return
+
+    now = timezone.now()
+    for model, ids in batches.items():
+        model.objects.filter(id__in=ids).update(last_accessed=now)
+
+
+def _ensure_flusher():
+    """Start the background flush thread on first use. Caller holds _lock."""
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    _flusher = threading.Thread(target=_run, name="molt-ttl-flusher", daemon=True)
+    _flusher.start()
+
+
+def _run():
+    stop = threading.Event()
+    while True:
+        stop.wait(FLUSH_INTERVAL)
+        try:
+            close_old_connections()
+            flush()
+        except Exception:
+            # Best-effort: a failed flush only delays the TTL bump
+            logger.warning("TTL flush failed", exc_info=True)
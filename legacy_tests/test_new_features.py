@@ -4,16 +4,22 @@ Test script for the new features: Read/Write Keys, Workspaces, and Partial Fetch
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "http://127.0.0.1:8000/api/v1"
 
+# One pooled session for the whole script: every call reuses a single
+# keep-alive connection instead of paying a TCP handshake per request.
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
 def test_document_read_write_keys():
     """Test the dual-key model for documents"""
     print("\n=== Testing Document Read/Write Keys ===")
     
     # Create a document
     print("1. Creating a document...")
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/docs",
         json={"content": "# Test Document\n\nThis is a test document.\n\nLine 3\nLine 4\nLine 5"},
         headers={"Content-Type": "application/json"}
@@ -29,7 +35,7 @@ def test_document_read_write_keys():
     
     # Read with write key
     print("\n2. Reading with write key...")
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/docs/{doc_id}",
         headers={"X-Molt-Key": write_key, "Accept": "application/json"}
     )
@@ -38,7 +44,7 @@ def test_document_read_write_keys():
     
     # Read with read key
     print("\n3. Reading with read key...")
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/docs/{doc_id}",
         headers={"X-Molt-Key": read_key, "Accept": "application/json"}
     )
@@ -47,7 +53,7 @@ def test_document_read_write_keys():
     
     # Try to write with read key (should fail)
     print("\n4. Attempting to write with read key (should fail)...")
-    response = requests.put(
+    response = SESSION.put(
         f"{BASE_URL}/docs/{doc_id}",
         data="# Modified Content",
         headers={"X-Molt-Key": read_key, "Content-Type": "text/markdown"}
@@ -59,7 +65,7 @@ def test_document_read_write_keys():
     
     # Write with write key
     print("\n5. Writing with write key...")
-    response = requests.put(
+    response = SESSION.put(
         f"{BASE_URL}/docs/{doc_id}",
         data="# Modified Content\n\nThis has been updated!",
         headers={"X-Molt-Key": write_key, "Content-Type": "text/markdown"}
@@ -69,7 +75,7 @@ def test_document_read_write_keys():
     
     # Try to delete with read key (should fail)
     print("\n6. Attempting to delete with read key (should fail)...")
-    response = requests.delete(
+    response = SESSION.delete(
         f"{BASE_URL}/docs/{doc_id}",
         headers={"X-Molt-Key": read_key}
     )
@@ -86,7 +92,7 @@ def test_partial_fetch(doc_id, write_key):
     
     # Create a document with multiple lines
     print("1. Creating a document with multiple lines...")
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/docs",
         json={"content": "Line 1\nLine 2\nLine 3\nLine 4\nLine 5\nLine 6\nLine 7\nLine 8\nLine 9\nLine 10"},
         headers={"Content-Type": "application/json"}
@@ -97,7 +103,7 @@ def test_partial_fetch(doc_id, write_key):
     
     # Fetch first line only
     print("\n2. Fetching first line only...")
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/docs/{doc_id}?lines=1",
         headers={"X-Molt-Key": doc_key, "Accept": "text/markdown"}
     )
@@ -112,7 +118,7 @@ def test_partial_fetch(doc_id, write_key):
     
     # Fetch first 3 lines
     print("\n3. Fetching first 3 lines...")
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/docs/{doc_id}?lines=3",
         headers={"X-Molt-Key": doc_key, "Accept": "text/markdown"}
     )
@@ -123,7 +129,7 @@ def test_partial_fetch(doc_id, write_key):
     
     # Fetch all lines (should not be truncated)
     print("\n4. Fetching all lines...")
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/docs/{doc_id}",
         headers={"X-Molt-Key": doc_key, "Accept": "text/markdown"}
     )
@@ -135,7 +141,7 @@ def test_partial_fetch(doc_id, write_key):
     
     # Test invalid lines parameter
     print("\n5. Testing invalid lines parameter...")
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/docs/{doc_id}?lines=0",
         headers={"X-Molt-Key": doc_key}
     )
@@ -151,7 +157,7 @@ def test_workspaces():
     
     # Create some documents first
     print("1. Creating test documents...")
-    doc1_response = requests.post(
+    doc1_response = SESSION.post(
         f"{BASE_URL}/docs",
         json={"content": "# Document 1\n\nFirst document content"},
         headers={"Content-Type": "application/json"}
@@ -160,7 +166,7 @@ def test_workspaces():
     doc1_write_key = doc1_response.json()["write_key"]
     doc1_read_key = doc1_response.json()["read_key"]
     
-    doc2_response = requests.post(
+    doc2_response = SESSION.post(
         f"{BASE_URL}/docs",
         json={"content": "# Document 2\n\nSecond document content"},
         headers={"Content-Type": "application/json"}
@@ -179,7 +185,7 @@ def test_workspaces():
             {"type": "md", "id": doc2_id, "key": doc2_write_key}
         ]
     }
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/workspaces",
         json=workspace_data,
         headers={"Content-Type": "application/json"}
@@ -195,7 +201,7 @@ def test_workspaces():
     
     # Read workspace with write key
     print("\n3. Reading workspace with write key...")
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/workspaces/{ws_id}",
         headers={"X-Molt-Key": ws_write_key}
     )
@@ -209,7 +215,7 @@ def test_workspaces():
     
     # Read workspace with read key
     print("\n4. Reading workspace with read key...")
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/workspaces/{ws_id}",
         headers={"X-Molt-Key": ws_read_key}
     )
@@ -218,7 +224,7 @@ def test_workspaces():
     
     # Try to update with read key (should fail)
     print("\n5. Attempting to update with read key (should fail)...")
-    response = requests.put(
+    response = SESSION.put(
         f"{BASE_URL}/workspaces/{ws_id}",
         json={"name": "Modified", "entries": []},
         headers={"X-Molt-Key": ws_read_key, "Content-Type": "application/json"}
@@ -234,7 +240,7 @@ def test_workspaces():
             {"type": "md", "id": doc1_id, "key": doc1_write_key}
         ]
     }
-    response = requests.put(
+    response = SESSION.put(
         f"{BASE_URL}/workspaces/{ws_id}",
         json=updated_data,
         headers={"X-Molt-Key": ws_write_key, "Content-Type": "application/json"}
@@ -244,7 +250,7 @@ def test_workspaces():
     
     # Test workspace with preview
     print("\n7. Testing workspace with preview_lines...")
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/workspaces/{ws_id}?preview_lines=1",
         headers={"X-Molt-Key": ws_write_key}
     )
@@ -263,7 +269,7 @@ def test_workspaces():
             {"type": "md", "id": doc2_id, "key": doc2_write_key}
         ]
     }
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/workspaces",
         json=nested_workspace_data,
         headers={"Content-Type": "application/json"}
@@ -275,7 +281,7 @@ def test_workspaces():
     
     # Read parent workspace
     print("\n9. Reading parent workspace...")
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/workspaces/{parent_ws_id}",
         headers={"X-Molt-Key": parent_ws_key}
     )
@@ -288,7 +294,7 @@ def test_workspaces():
     
     # Test delete with write key
     print("\n10. Deleting workspace with write key...")
-    response = requests.delete(
+    response = SESSION.delete(
         f"{BASE_URL}/workspaces/{ws_id}",
         headers={"X-Molt-Key": ws_write_key}
     )
@@ -297,7 +303,7 @@ def test_workspaces():
     
     # Verify deletion
     print("\n11. Verifying deletion...")
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/workspaces/{ws_id}",
         headers={"X-Molt-Key": ws_write_key}
     )
@@ -314,7 +320,7 @@ def test_workspace_scoped_access():
     
     # Create a document
     print("1. Creating a test document...")
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/docs",
         json={"content": "# Scoped Doc\n\nContent accessible through workspace."},
         headers={"Content-Type": "application/json"}
@@ -327,7 +333,7 @@ def test_workspace_scoped_access():
     
     # Create a workspace containing the document (with write key)
     print("\n2. Creating a workspace with the document...")
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/workspaces",
         json={
             "name": "Scoped Workspace",
@@ -345,7 +351,7 @@ def test_workspace_scoped_access():
     
     # Read document through workspace with write key
     print("\n3. Reading document through workspace with write key...")
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/docs/{doc_id}",
         headers={
             "X-Molt-Key": ws_write_key,
@@ -359,7 +365,7 @@ def test_workspace_scoped_access():
     
     # Read document through workspace with read key
     print("\n4. Reading document through workspace with read key...")
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/docs/{doc_id}",
         headers={
             "X-Molt-Key": ws_read_key,
@@ -372,7 +378,7 @@ def test_workspace_scoped_access():
     
     # Partial fetch through workspace
     print("\n5. Partial fetch through workspace...")
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/docs/{doc_id}?lines=1",
         headers={
             "X-Molt-Key": ws_write_key,
@@ -387,7 +393,7 @@ def test_workspace_scoped_access():
     
     # Try to write through workspace with READ key (should fail - permission downgrade)
     print("\n6. Attempting to write through workspace with read key (should fail)...")
-    response = requests.put(
+    response = SESSION.put(
         f"{BASE_URL}/docs/{doc_id}",
         data="# Should Not Work",
         headers={
@@ -401,7 +407,7 @@ def test_workspace_scoped_access():
     
     # Write through workspace with WRITE key, then verify doc is still readable with its own key
     print("\n6b. Writing through workspace with write key, then reading with doc key...")
-    response = requests.put(
+    response = SESSION.put(
         f"{BASE_URL}/docs/{doc_id}",
         data="# Updated Through Workspace\n\nModified via workspace write key.",
         headers={
@@ -412,14 +418,14 @@ def test_workspace_scoped_access():
     )
     assert response.status_code == 200, f"Failed to write through workspace: {response.text}"
     # Now read with the document's own write key (must still work!)
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/docs/{doc_id}",
         headers={"X-Molt-Key": doc_write_key, "Accept": "application/json"}
     )
     assert response.status_code == 200, f"Doc unreadable after workspace PUT: {response.text}"
     assert "Updated Through Workspace" in response.json()["content"]
     # Also verify with the document's read key
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/docs/{doc_id}",
         headers={"X-Molt-Key": doc_read_key, "Accept": "application/json"}
     )
@@ -428,7 +434,7 @@ def test_workspace_scoped_access():
     
     # Try to delete through workspace with read key (should fail)
     print("\n7. Attempting to delete through workspace with read key (should fail)...")
-    response = requests.delete(
+    response = SESSION.delete(
         f"{BASE_URL}/docs/{doc_id}",
         headers={
             "X-Molt-Key": ws_read_key,
@@ -440,7 +446,7 @@ def test_workspace_scoped_access():
     
     # Try to access non-existent doc through workspace
     print("\n8. Accessing non-existent doc in workspace (should fail)...")
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/docs/00000000-0000-0000-0000-000000000000",
         headers={
             "X-Molt-Key": ws_write_key,
@@ -452,8 +458,8 @@ def test_workspace_scoped_access():
     print(f"   ✓ Non-existent doc correctly returns 404")
     
     # Cleanup
-    requests.delete(f"{BASE_URL}/workspaces/{ws_id}", headers={"X-Molt-Key": ws_write_key})
-    requests.delete(f"{BASE_URL}/docs/{doc_id}", headers={"X-Molt-Key": doc_write_key})
+    SESSION.delete(f"{BASE_URL}/workspaces/{ws_id}", headers={"X-Molt-Key": ws_write_key})
+    SESSION.delete(f"{BASE_URL}/docs/{doc_id}", headers={"X-Molt-Key": doc_write_key})
     
     print("\n✅ All workspace-scoped access tests passed!")
 
@@ -462,7 +468,7 @@ def test_metrics():
     """Test metrics endpoint"""
     print("\n=== Testing Metrics ===")
     
-    response = requests.get(f"{BASE_URL}/metrics")
+    response = SESSION.get(f"{BASE_URL}/metrics")
     assert response.status_code == 200, f"Failed to fetch metrics: {response.text}"
     data = response.json()
     assert "documents" in data, "documents count missing"
@@ -504,3 +510,5 @@ if __name__ == "__main__":
         import traceback
         traceback.print_exc()
         exit(1)
+    finally:
+        SESSION.close()
@@ -10,34 +10,134 @@ from unittest.mock import patch
 # Disable throttling for all tests
 @pytest.fixture(scope="session", autouse=True)
 def django_db_setup(django_db_setup, django_db_blocker):
-    """Setup test database and configure settings."""
-    pass
+    """Setup test database and warm up a persistent connection.
 
+    CONN_MAX_AGE=None keeps one connection alive for the whole session
+    and ensure_connection opens it up front, so individual tests never
+    pay connection setup. A no-op for in-memory SQLite, but it matters
+    when the suite runs against a server-backed database.
+    """
+    from django.conf import settings
+    from django.db import connection
 
-@pytest.fixture(autouse=True)
-def disable_throttling(settings, monkeypatch):
-    """Disable rate limiting for all tests."""
-    # Remove all throttle classes from settings
-    settings.REST_FRAMEWORK['DEFAULT_THROTTLE_CLASSES'] = []
-    settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = {}
-    
-    # Mock the throttle classes to always allow requests
+    settings.DATABASES["default"]["CONN_MAX_AGE"] = None
+    with django_db_blocker.unblock():
+        connection.ensure_connection()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def disable_throttling():
+    """Disable rate limiting for the whole session.
+
+    Done once instead of per test: the settings tweak plus monkeypatch
+    teardown used to run for every single test. The DRF settings cache
+    is reloaded around the change so the empty throttle list is what
+    views see.
+    """
+    from django.conf import settings
+    from rest_framework.settings import api_settings
     from app.throttling import CreateDocumentThrottle, MonitoringThrottle
-    
-    def mock_allow_request(self, request, view):
-        return True
-    
-    monkeypatch.setattr(CreateDocumentThrottle, 'allow_request', mock_allow_request)
-    monkeypatch.setattr(MonitoringThrottle, 'allow_request', mock_allow_request)
 
+    original_classes = settings.REST_FRAMEWORK["DEFAULT_THROTTLE_CLASSES"]
+    settings.REST_FRAMEWORK["DEFAULT_THROTTLE_CLASSES"] = []
+    api_settings.reload()
 
-@pytest.fixture
+    # View-level throttles are referenced by class, so settings alone
+    # don't cover them — stub their allow_request for the session
+    with patch.object(CreateDocumentThrottle, "allow_request", lambda *a, **k: True), \
+         patch.object(MonitoringThrottle, "allow_request", lambda *a, **k: True):
+        yield
+
+    settings.REST_FRAMEWORK["DEFAULT_THROTTLE_CLASSES"] = original_classes
+    api_settings.reload()
+
+
+@pytest.fixture(scope="session")
 def api_client():
-    """Return a Django REST Framework API client."""
+    """Return a Django REST Framework API client (one per session)."""
     return APIClient()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def django_client():
-    """Return a Django test client."""
+    """Return a Django test client (one per session)."""
     return Client()
+
+
+def etag(version):
+    """Format a version as the API's quoted ETag / If-Match value."""
+    return f'"v{version}"'
+
+
+def _create_document(content=""):
+    """Create a Document row directly via the ORM.
+
+    Uses the same encryption and key derivation as the create view, so
+    the stored row is indistinguishable from an API-created document.
+    Imports stay local — conftest is imported before Django is set up.
+    """
+    from types import SimpleNamespace
+    from app.models import Document
+    from app import encryption
+
+    write_key_raw = encryption.generate_raw_key()
+    read_key_raw = encryption.derive_read_key_raw(write_key_raw)
+    content_bytes = content.encode("utf-8")
+    ciphertext, nonce = encryption.encrypt_bytes(content_bytes, read_key_raw)
+    preview_ct, preview_nonce = encryption.encrypt_bytes(
+        content_bytes[:4096], read_key_raw
+    )
+    document = Document.objects.create(
+        content_encrypted=ciphertext,
+        nonce=nonce,
+        read_key_hash=encryption.hash_raw_key(read_key_raw),
+        preview_encrypted=preview_ct,
+        preview_nonce=preview_nonce,
+        version=1,
+    )
+    return SimpleNamespace(
+        id=str(document.id),
+        write_key=encryption.encode_key(write_key_raw),
+        read_key=encryption.encode_key(read_key_raw),
+    )
+
+
+@pytest.fixture
+def make_document(db):
+    """Factory creating Document rows directly via the ORM.
+
+    Most tests only need an existing document's id and keys; building
+    the row here skips the POST round-trip through routing, parsing,
+    and serializers that each test used to pay just for setup. The
+    create endpoint keeps its own dedicated API-level tests.
+    """
+    return _create_document
+
+
+@pytest.fixture(scope="session")
+def document_factory():
+    """The raw document factory, for broader-scoped fixtures.
+
+    Unlike make_document this carries no db dependency; callers manage
+    their own access via django_db_blocker.
+    """
+    return _create_document
+
+
+@pytest.fixture(scope="session")
+def api_rf():
+    """APIRequestFactory for calling views directly.
+
+    Skips the WSGI middleware chain entirely — for tests that assert on
+    pure view behavior, not the full request pipeline.
+    """
+    from rest_framework.test import APIRequestFactory
+    return APIRequestFactory()
+
+
+@pytest.fixture(autouse=True)
+def _reset_client_state(api_client):
+    """Clear per-test client state so session-scoped clients stay clean."""
+    yield
+    api_client.credentials()
+    api_client.cookies.clear()
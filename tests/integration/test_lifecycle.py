@@ -0,0 +1,154 @@
+"""
+Integration tests for the document lifecycle against a live server.
+
+Pytest port of the legacy test_api.py script. The causal
+create -> update -> conflict -> append -> delete chain stays in a
+single test so a mid-chain failure stops immediately, while the
+independent checks (wrong key, empty document) run as their own tests.
+Deselect with -m "not integration" when only the in-process suite is
+wanted.
+"""
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from tests.conftest import etag
+
+pytestmark = pytest.mark.integration
+
+INITIAL_CONTENT = "# Hello World\nThis is a test document."
+UPDATED_CONTENT = "# Updated Title\nThis content has been updated."
+APPENDED_SECTION = "## Appended Section\nThis was appended."
+EXPECTED_APPENDED = f"{UPDATED_CONTENT}\n{APPENDED_SECTION}"
+
+
+@pytest.fixture(scope="module")
+def session():
+    """One keep-alive HTTP session shared by every test in the module."""
+    s = requests.Session()
+    s.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def api(live_server, session):
+    """Tiny helper binding the session to the live server's API root."""
+    base = f"{live_server.url}/api/v1"
+
+    def request(method, path, **kwargs):
+        return session.request(method, base + path, **kwargs)
+
+    return request
+
+
+def _create_document(api, content=None):
+    payload = {} if content is None else {"content": content}
+    response = api("POST", "/docs", json=payload)
+    assert response.status_code == 201, response.text
+    data = response.json()
+    return data["id"], data["write_key"]
+
+
+def test_health_check(api):
+    """Health check responds over a real HTTP connection."""
+    response = api("GET", "/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+
+
+def test_document_lifecycle(api):
+    """Full causal chain: create, read, update, conflict, append, delete."""
+    doc_id, key = _create_document(api, INITIAL_CONTENT)
+
+    # Read as JSON
+    response = api(
+        "GET", f"/docs/{doc_id}",
+        headers={"X-Molt-Key": key, "Accept": "application/json"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["content"] == INITIAL_CONTENT
+    assert data["version"] == 1
+    assert response.headers.get("ETag") == etag(1)
+
+    # Read as markdown
+    response = api(
+        "GET", f"/docs/{doc_id}",
+        headers={"X-Molt-Key": key, "Accept": "text/markdown"},
+    )
+    assert response.status_code == 200
+    assert response.text == INITIAL_CONTENT
+    assert response.headers["Content-Type"].startswith("text/markdown")
+
+    # Update
+    response = api(
+        "PUT", f"/docs/{doc_id}",
+        headers={
+            "X-Molt-Key": key,
+            "Content-Type": "text/markdown",
+            "If-Match": etag(1),
+        },
+        data=UPDATED_CONTENT,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert data["version"] == 2
+
+    # Stale If-Match conflicts
+    response = api(
+        "PUT", f"/docs/{doc_id}",
+        headers={
+            "X-Molt-Key": key,
+            "Content-Type": "text/markdown",
+            "If-Match": etag(1),
+        },
+        data="This should conflict",
+    )
+    assert response.status_code == 409
+    data = response.json()
+    assert data["error"] == "conflict"
+    assert data["current_version"] == 2
+
+    # Append
+    response = api(
+        "PATCH", f"/docs/{doc_id}",
+        headers={
+            "X-Molt-Key": key,
+            "Content-Type": "text/markdown",
+            "If-Match": etag(2),
+        },
+        data=APPENDED_SECTION,
+    )
+    assert response.status_code == 200
+    assert response.json()["version"] == 3
+    # The response reports the combined plaintext size, so the append is
+    # verified without a follow-up GET
+    assert response.headers["X-Molt-Content-Length"] == str(len(EXPECTED_APPENDED))
+
+    # Delete, then confirm it is gone
+    response = api("DELETE", f"/docs/{doc_id}", headers={"X-Molt-Key": key})
+    assert response.status_code == 204
+
+    response = api("GET", f"/docs/{doc_id}", headers={"X-Molt-Key": key})
+    assert response.status_code == 404
+    assert response.json()["error"] == "not_found"
+
+
+def test_wrong_key_rejected(api):
+    """A bad key is refused without leaking document state."""
+    doc_id, _ = _create_document(api, "Secret content")
+    response = api(
+        "GET", f"/docs/{doc_id}", headers={"X-Molt-Key": "wrong_key_123"}
+    )
+    assert response.status_code == 403
+    assert response.json()["error"] == "forbidden"
+
+
+def test_empty_document(api):
+    """An empty document round-trips as an empty body."""
+    doc_id, key = _create_document(api)
+    response = api("GET", f"/docs/{doc_id}", headers={"X-Molt-Key": key})
+    assert response.status_code == 200, response.text
+    assert response.text == ""
@@ -3,6 +3,15 @@ Tests for basic API functionality including health check and document lifecycle.
 """
 import pytest
 
+from tests.conftest import etag
+
+
+@pytest.fixture(scope="module")
+def read_doc(django_db_setup, django_db_blocker, document_factory):
+    """One document shared by the read-only Accept-header tests."""
+    with django_db_blocker.unblock():
+        return document_factory("# Test Content\nLine 2")
+
 
 @pytest.mark.django_db
 class TestHealthEndpoint:
@@ -15,6 +24,44 @@ class TestHealthEndpoint:
         assert response.json()["status"] == "ok"
 
 
+@pytest.mark.django_db
+class TestDocumentConditionalGet:
+    """Tests for If-None-Match conditional reads on documents."""
+
+    def test_matching_etag_returns_304(self, api_client, read_doc):
+        """Test that a current ETag short-circuits to 304 with no body."""
+        response = api_client.get(
+            f"/api/v1/docs/{read_doc.id}",
+            HTTP_X_MOLT_KEY=read_doc.write_key,
+            HTTP_IF_NONE_MATCH=etag(1)
+        )
+        assert response.status_code == 304
+        assert response["ETag"] == etag(1)
+        assert response.content == b""
+
+    def test_stale_etag_returns_full_body(self, api_client, read_doc):
+        """Test that a stale ETag falls through to a normal 200 read."""
+        response = api_client.get(
+            f"/api/v1/docs/{read_doc.id}",
+            HTTP_X_MOLT_KEY=read_doc.write_key,
+            HTTP_IF_NONE_MATCH=etag(0),
+            HTTP_ACCEPT="text/markdown"
+        )
+        assert response.status_code == 200
+        assert response.content.decode() == "# Test Content\nLine 2"
+        assert response["ETag"] == etag(1)
+
+    def test_matching_etag_still_requires_valid_key(self, api_client, read_doc):
+        """Test that the 304 shortcut authenticates before answering."""
+        response = api_client.get(
+            f"/api/v1/docs/{read_doc.id}",
+            HTTP_X_MOLT_KEY="wrong_key_123",
+            HTTP_IF_NONE_MATCH=etag(1)
+        )
+        assert response.status_code == 403
+        assert response.json()["error"] == "forbidden"
+
+
 @pytest.mark.django_db
 class TestDocumentLifecycle:
     """Tests for document CRUD operations."""
@@ -40,179 +87,103 @@ class TestDocumentLifecycle:
         assert "id" in data
         assert "write_key" in data
 
-    def test_read_document_with_write_key(self, api_client):
-        """Test reading a document with write key."""
-        # Create document
-        create_response = api_client.post(
-            "/api/v1/docs",
-            {"content": "# Test Content"},
-            format="json"
-        )
-        doc_id = create_response.json()["id"]
-        write_key = create_response.json()["write_key"]
-
-        # Read with write key
-        response = api_client.get(
-            f"/api/v1/docs/{doc_id}",
-            HTTP_X_MOLT_KEY=write_key,
-            HTTP_ACCEPT="application/json"
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert data["content"] == "# Test Content"
-        assert data["version"] == 1
-
-    def test_read_document_as_markdown(self, api_client):
-        """Test reading a document with text/markdown accept header."""
-        # Create document
-        create_response = api_client.post(
-            "/api/v1/docs",
-            {"content": "# Test Content\nLine 2"},
-            format="json"
-        )
-        doc_id = create_response.json()["id"]
-        write_key = create_response.json()["write_key"]
-
-        # Read as markdown
+    @pytest.mark.parametrize("accept", ["application/json", "text/markdown"])
+    def test_read_document(self, api_client, read_doc, accept):
+        """Test reading a document as JSON or markdown with the write key."""
         response = api_client.get(
-            f"/api/v1/docs/{doc_id}",
-            HTTP_X_MOLT_KEY=write_key,
-            HTTP_ACCEPT="text/markdown"
+            f"/api/v1/docs/{read_doc.id}",
+            HTTP_X_MOLT_KEY=read_doc.write_key,
+            HTTP_ACCEPT=accept
         )
         assert response.status_code == 200
-        assert response.content.decode() == "# Test Content\nLine 2"
-        assert response["Content-Type"].startswith("text/markdown")
-
-    def test_update_document(self, api_client):
+        if accept == "application/json":
+            data = response.json()
+            assert data["content"] == "# Test Content\nLine 2"
+            assert data["version"] == 1
+        else:
+            assert response.content.decode() == "# Test Content\nLine 2"
+            assert response["Content-Type"].startswith("text/markdown")
+
+    def test_update_document(self, api_client, make_document):
         """Test updating a document with PUT."""
-        # Create document
-        create_response = api_client.post(
-            "/api/v1/docs",
-            {"content": "Original content"},
-            format="json"
-        )
-        doc_id = create_response.json()["id"]
-        write_key = create_response.json()["write_key"]
+        doc = make_document("Original content")
 
         # Update document
         response = api_client.put(
-            f"/api/v1/docs/{doc_id}",
+            f"/api/v1/docs/{doc.id}",
             "Updated content",
             content_type="text/markdown",
-            HTTP_X_MOLT_KEY=write_key,
-            HTTP_IF_MATCH='"v1"'
+            HTTP_X_MOLT_KEY=doc.write_key,
+            HTTP_IF_MATCH=etag(1)
         )
         assert response.status_code == 200
         data = response.json()
         assert data["success"] is True
         assert data["version"] == 2
 
-    def test_version_conflict(self, api_client):
+    def test_version_conflict(self, api_client, make_document):
         """Test that version conflicts are detected."""
-        # Create document
-        create_response = api_client.post(
-            "/api/v1/docs",
-            {"content": "Original"},
-            format="json"
-        )
-        doc_id = create_response.json()["id"]
-        write_key = create_response.json()["write_key"]
+        doc = make_document("Original")
+        url = f"/api/v1/docs/{doc.id}"
+        extra = {"HTTP_X_MOLT_KEY": doc.write_key, "HTTP_IF_MATCH": etag(1)}
 
         # Update once
-        api_client.put(
-            f"/api/v1/docs/{doc_id}",
-            "First update",
-            content_type="text/markdown",
-            HTTP_X_MOLT_KEY=write_key,
-            HTTP_IF_MATCH='"v1"'
-        )
+        api_client.generic("PUT", url, "First update", "text/markdown", **extra)
 
-        # Try to update with old version
-        response = api_client.put(
-            f"/api/v1/docs/{doc_id}",
-            "Second update",
-            content_type="text/markdown",
-            HTTP_X_MOLT_KEY=write_key,
-            HTTP_IF_MATCH='"v1"'  # Old version
+        # Try to update with the old version still in If-Match
+        response = api_client.generic(
+            "PUT", url, "Second update", "text/markdown", **extra
         )
         assert response.status_code == 409
         data = response.json()
         assert data["error"] == "conflict"
         assert data["current_version"] == 2
 
-    def test_append_to_document(self, api_client):
+    def test_append_to_document(self, api_client, make_document):
         """Test appending content to a document with PATCH."""
-        # Create document
-        create_response = api_client.post(
-            "/api/v1/docs",
-            {"content": "Original content"},
-            format="json"
-        )
-        doc_id = create_response.json()["id"]
-        write_key = create_response.json()["write_key"]
+        original = "Original content"
+        appended = "\nAppended content"
+        doc = make_document(original)
 
         # Append content
-        response = api_client.patch(
-            f"/api/v1/docs/{doc_id}",
-            "\nAppended content",
-            content_type="text/markdown",
-            HTTP_X_MOLT_KEY=write_key,
-            HTTP_IF_MATCH='"v1"'
+        response = api_client.generic(
+            "PATCH", f"/api/v1/docs/{doc.id}", appended, "text/markdown",
+            HTTP_X_MOLT_KEY=doc.write_key, HTTP_IF_MATCH=etag(1)
         )
         assert response.status_code == 200
         data = response.json()
         assert data["version"] == 2
 
-        # Verify content (append adds newline separator if not present)
-        read_response = api_client.get(
-            f"/api/v1/docs/{doc_id}",
-            HTTP_X_MOLT_KEY=write_key,
-            HTTP_ACCEPT="text/markdown"
-        )
-        content = read_response.content.decode()
-        assert "Original content" in content
-        assert "Appended content" in content
+        # The append adds a newline separator; the response reports the
+        # resulting plaintext size, so no read-back GET is needed
+        expected = f"{original}\n{appended}"
+        assert response["X-Molt-Content-Length"] == str(len(expected))
 
-    def test_wrong_key_rejected(self, api_client):
+    def test_wrong_key_rejected(self, api_client, read_doc):
         """Test that wrong keys are rejected."""
-        # Create document
-        create_response = api_client.post(
-            "/api/v1/docs",
-            {"content": "Secret content"},
-            format="json"
-        )
-        doc_id = create_response.json()["id"]
-
-        # Try to read with wrong key
+        # Try to read the shared document with a wrong key
         response = api_client.get(
-            f"/api/v1/docs/{doc_id}",
+            f"/api/v1/docs/{read_doc.id}",
             HTTP_X_MOLT_KEY="wrong_key_123"
         )
         assert response.status_code == 403
         assert response.json()["error"] == "forbidden"
 
-    def test_delete_document(self, api_client):
+    def test_delete_document(self, api_client, make_document):
         """Test deleting a document."""
-        # Create document
-        create_response = api_client.post(
-            "/api/v1/docs",
-            {"content": "To be deleted"},
-            format="json"
-        )
-        doc_id = create_response.json()["id"]
-        write_key = create_response.json()["write_key"]
+        doc = make_document("To be deleted")
 
         # Delete document
         response = api_client.delete(
-            f"/api/v1/docs/{doc_id}",
-            HTTP_X_MOLT_KEY=write_key
+            f"/api/v1/docs/{doc.id}",
+            HTTP_X_MOLT_KEY=doc.write_key
         )
         assert response.status_code == 204
 
         # Verify it's gone
         read_response = api_client.get(
-            f"/api/v1/docs/{doc_id}",
-            HTTP_X_MOLT_KEY=write_key
+            f"/api/v1/docs/{doc.id}",
+            HTTP_X_MOLT_KEY=doc.write_key
         )
         assert read_response.status_code == 404
         assert read_response.json()["error"] == "not_found"
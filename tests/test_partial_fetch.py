@@ -1,118 +1,79 @@
 """
 Tests for partial document fetch functionality.
 """
+import uuid
+
 import pytest
 
+FIVE_LINES = "\n".join(f"Line {i}" for i in range(1, 6))
 
-@pytest.mark.django_db
-class TestPartialFetch:
-    """Tests for fetching partial document content."""
 
-    def test_fetch_first_line_only(self, api_client):
-        """Test fetching only the first line of a document."""
-        # Create document with multiple lines
-        create_response = api_client.post(
-            "/api/v1/docs",
-            {"content": "Line 1\nLine 2\nLine 3\nLine 4\nLine 5"},
-            format="json"
-        )
-        doc_id = create_response.json()["id"]
-        write_key = create_response.json()["write_key"]
+@pytest.fixture(scope="module")
+def partial_doc(django_db_setup, django_db_blocker, document_factory):
+    """One five-line document shared by every read-only test here."""
+    with django_db_blocker.unblock():
+        return document_factory(FIVE_LINES)
 
-        # Fetch first line only
-        response = api_client.get(
-            f"/api/v1/docs/{doc_id}?lines=1",
-            HTTP_X_MOLT_KEY=write_key,
-            HTTP_ACCEPT="text/markdown"
-        )
-        assert response.status_code == 200
-        assert response.content.decode() == "Line 1"
-        assert response["X-Molt-Truncated"] == "true"
-        assert response["X-Molt-Total-Lines"] == "5"
 
-    def test_fetch_multiple_lines(self, api_client):
-        """Test fetching first N lines of a document."""
-        # Create document
-        create_response = api_client.post(
-            "/api/v1/docs",
-            {"content": "Line 1\nLine 2\nLine 3\nLine 4\nLine 5"},
-            format="json"
-        )
-        doc_id = create_response.json()["id"]
-        write_key = create_response.json()["write_key"]
+def _get_document_view(api_rf, path, doc_id, **extra):
+    """Call DocumentDetailView directly, skipping the middleware stack."""
+    from app.views import DocumentDetailView
 
-        # Fetch first 3 lines
-        response = api_client.get(
-            f"/api/v1/docs/{doc_id}?lines=3",
-            HTTP_X_MOLT_KEY=write_key,
-            HTTP_ACCEPT="text/markdown"
-        )
-        assert response.status_code == 200
-        assert response.content.decode() == "Line 1\nLine 2\nLine 3"
-        assert response["X-Molt-Truncated"] == "true"
-        assert response["X-Molt-Total-Lines"] == "5"
+    request = api_rf.get(path, **extra)
+    response = DocumentDetailView.as_view()(request, doc_id=uuid.UUID(doc_id))
+    if hasattr(response, "render") and not response.is_rendered:
+        response.render()
+    return response
 
-    def test_fetch_all_lines_not_truncated(self, api_client):
-        """Test that fetching full document doesn't add truncation headers."""
-        # Create document
-        create_response = api_client.post(
-            "/api/v1/docs",
-            {"content": "Line 1\nLine 2\nLine 3"},
-            format="json"
-        )
-        doc_id = create_response.json()["id"]
-        write_key = create_response.json()["write_key"]
 
-        # Fetch without lines parameter
-        response = api_client.get(
-            f"/api/v1/docs/{doc_id}",
-            HTTP_X_MOLT_KEY=write_key,
+@pytest.mark.django_db
+class TestPartialFetch:
+    """Tests for fetching partial document content."""
+
+    @pytest.mark.parametrize(
+        "lines,expected_body,truncated",
+        [
+            (1, "Line 1", True),
+            (3, "Line 1\nLine 2\nLine 3", True),
+            (None, FIVE_LINES, False),
+        ],
+    )
+    def test_fetch_lines(self, api_rf, partial_doc, lines, expected_body, truncated):
+        """Test fetching the first N lines (or all, without the parameter)."""
+        url = f"/api/v1/docs/{partial_doc.id}"
+        if lines is not None:
+            url += f"?lines={lines}"
+        response = _get_document_view(
+            api_rf,
+            url,
+            partial_doc.id,
+            HTTP_X_MOLT_KEY=partial_doc.write_key,
             HTTP_ACCEPT="text/markdown"
         )
         assert response.status_code == 200
-        assert "X-Molt-Truncated" not in response
-        assert response.content.decode() == "Line 1\nLine 2\nLine 3"
+        assert response.content.decode() == expected_body
+        if truncated:
+            assert response["X-Molt-Truncated"] == "true"
+            assert response["X-Molt-Total-Lines"] == "5"
+        else:
+            assert "X-Molt-Truncated" not in response
 
-    def test_invalid_lines_parameter(self, api_client):
-        """Test that invalid lines parameter returns 400."""
-        # Create document
-        create_response = api_client.post(
-            "/api/v1/docs",
-            {"content": "Line 1\nLine 2"},
-            format="json"
-        )
-        doc_id = create_response.json()["id"]
-        write_key = create_response.json()["write_key"]
-
-        # Try with 0 lines
-        response = api_client.get(
-            f"/api/v1/docs/{doc_id}?lines=0",
-            HTTP_X_MOLT_KEY=write_key
+    @pytest.mark.parametrize("lines", [0, -1])
+    def test_invalid_lines_parameter(self, api_rf, partial_doc, lines):
+        """Test that non-positive lines values return 400."""
+        response = _get_document_view(
+            api_rf,
+            f"/api/v1/docs/{partial_doc.id}?lines={lines}",
+            partial_doc.id,
+            HTTP_X_MOLT_KEY=partial_doc.write_key
         )
         assert response.status_code == 400
 
-        # Try with negative lines
-        response = api_client.get(
-            f"/api/v1/docs/{doc_id}?lines=-1",
-            HTTP_X_MOLT_KEY=write_key
-        )
-        assert response.status_code == 400
-
-    def test_partial_fetch_with_read_key(self, api_client):
+    def test_partial_fetch_with_read_key(self, api_client, partial_doc):
         """Test that partial fetch works with read key."""
-        # Create document
-        create_response = api_client.post(
-            "/api/v1/docs",
-            {"content": "Line 1\nLine 2\nLine 3"},
-            format="json"
-        )
-        doc_id = create_response.json()["id"]
-        read_key = create_response.json()["read_key"]
-
-        # Fetch with read key
         response = api_client.get(
-            f"/api/v1/docs/{doc_id}?lines=1",
-            HTTP_X_MOLT_KEY=read_key,
+            f"/api/v1/docs/{partial_doc.id}?lines=1",
+            HTTP_X_MOLT_KEY=partial_doc.read_key,
             HTTP_ACCEPT="text/markdown"
         )
         assert response.status_code == 200
@@ -0,0 +1,63 @@
+"""
+Tests for the in-process rate throttle.
+
+These call allow_request directly on a private subclass: the conftest
+session fixture stubs the shipped throttle subclasses out for the rest
+of the suite, and a private class with its own history dict keeps the
+shared module-level state out of the tests.
+"""
+import threading
+
+from rest_framework.test import APIRequestFactory
+
+from app.throttling import InProcessRateThrottle
+
+
+def _make_throttle(max_keys=10000):
+    class _UnitThrottle(InProcessRateThrottle):
+        scope = "unit"
+        rate = "3/min"
+        _lock = threading.Lock()
+        _history = {}
+        _MAX_TRACKED_KEYS = max_keys
+
+    return _UnitThrottle()
+
+
+class TestInProcessRateThrottle:
+    """Tests for the sliding window and the tracked-identity cap."""
+
+    def test_allows_up_to_rate_then_denies(self):
+        """Test that the rate is enforced and wait() reports a delay."""
+        throttle = _make_throttle()
+        request = APIRequestFactory().get("/api/v1/docs")
+
+        for _ in range(3):
+            assert throttle.allow_request(request, None) is True
+        assert throttle.allow_request(request, None) is False
+        assert throttle.wait() > 0
+
+    def test_window_slides(self):
+        """Test that requests are allowed again once the window passes."""
+        throttle = _make_throttle()
+        now = [1000.0]
+        throttle.timer = lambda: now[0]
+        request = APIRequestFactory().get("/api/v1/docs")
+
+        for _ in range(3):
+            assert throttle.allow_request(request, None) is True
+        assert throttle.allow_request(request, None) is False
+
+        now[0] += throttle.duration + 1
+        assert throttle.allow_request(request, None) is True
+
+    def test_tracked_identities_are_hard_capped(self):
+        """Test that spoofed identities within one window cannot grow the table."""
+        throttle = _make_throttle(max_keys=5)
+        rf = APIRequestFactory()
+
+        for i in range(20):
+            request = rf.get("/api/v1/docs", HTTP_X_FORWARDED_FOR=f"10.0.0.{i}")
+            assert throttle.allow_request(request, None) is True
+
+        assert len(type(throttle)._history) <= 5
@@ -0,0 +1,90 @@
+"""
+Tests for the deferred last_accessed updates in app/ttl.py.
+"""
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from app import ttl
+from app.models import Document, Workspace
+
+
+@pytest.fixture(autouse=True)
+def _no_background_flusher(monkeypatch):
+    """Keep the daemon flusher out of these tests.
+
+    schedule_touch normally spawns the background thread; here flush()
+    is called directly so the behaviour is deterministic. The pending
+    queue is cleared around each test so touches recorded by earlier
+    endpoint tests don't leak in.
+    """
+    monkeypatch.setattr(ttl, "_ensure_flusher", lambda: None)
+    with ttl._lock:
+        ttl._pending.clear()
+    yield
+    with ttl._lock:
+        ttl._pending.clear()
+
+
+def _backdate(model, ids):
+    """Push last_accessed into the past; update() bypasses auto_now."""
+    model.objects.filter(id__in=ids).update(
+        last_accessed=timezone.now() - timedelta(days=1)
+    )
+
+
+@pytest.mark.django_db
+class TestScheduleTouchAndFlush:
+    """Unit tests for the touch queue and its bulk flush."""
+
+    def test_flush_coalesces_to_one_update_per_model(
+        self, make_document, django_assert_num_queries
+    ):
+        """Test that queued touches become a single bulk UPDATE per model."""
+        doc_a = make_document("a")
+        doc_b = make_document("b")
+        workspace = Workspace.objects.create(content_encrypted=b"blob", nonce=b"n")
+        _backdate(Document, [doc_a.id, doc_b.id])
+        _backdate(Workspace, [workspace.id])
+        before = timezone.now()
+
+        ttl.schedule_touch(Document, doc_a.id)
+        ttl.schedule_touch(Document, doc_b.id)
+        ttl.schedule_touch(Workspace, workspace.id)
+        with django_assert_num_queries(2):
+            ttl.flush()
+
+        touched = Document.objects.filter(id__in=[doc_a.id, doc_b.id])
+        assert all(d.last_accessed >= before for d in touched)
+        assert Workspace.objects.get(id=workspace.id).last_accessed >= before
+
+    def test_flush_with_empty_queue_is_a_no_op(self, django_assert_num_queries):
+        """Test that flushing nothing touches neither the lock-held dict nor the DB."""
+        with django_assert_num_queries(0):
+            ttl.flush()
+
+    def test_pending_ids_clear_after_flush(
+        self, make_document, django_assert_num_queries
+    ):
+        """Test that a flushed batch is not re-flushed."""
+        doc = make_document("once")
+        ttl.schedule_touch(Document, doc.id)
+        ttl.flush()
+
+        with django_assert_num_queries(0):
+            ttl.flush()
+
+    def test_get_extends_document_ttl(self, api_client, make_document):
+        """Test that reading a document still bumps last_accessed via the queue."""
+        doc = make_document("still alive")
+        _backdate(Document, [doc.id])
+        stale = Document.objects.get(id=doc.id).last_accessed
+
+        response = api_client.get(
+            f"/api/v1/docs/{doc.id}", HTTP_X_MOLT_KEY=doc.write_key
+        )
+        assert response.status_code == 200
+        ttl.flush()
+
+        assert Document.objects.get(id=doc.id).last_accessed > stale
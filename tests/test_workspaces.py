@@ -3,6 +3,55 @@ Tests for workspace functionality.
 """
 import pytest
 
+from app import encryption
+from app.models import Document
+
+
+def _create_workspace(api_client, entries):
+    """Create a workspace over the API and return its id and write key."""
+    response = api_client.post(
+        "/api/v1/workspaces",
+        {"name": "Preview Workspace", "entries": entries},
+        format="json"
+    )
+    assert response.status_code == 201
+    data = response.json()
+    return data["id"], data["write_key"]
+
+
+def _legacy_document(content, with_hash=True):
+    """Create a pre-migration Document row: no stored preview prefix.
+
+    With with_hash=False the row also predates the dual-key model
+    (read_key_hash is NULL and the single key encrypts directly).
+    """
+    raw_key = encryption.generate_raw_key()
+    if with_hash:
+        read_key_raw = encryption.derive_read_key_raw(raw_key)
+        read_key_hash = encryption.hash_raw_key(read_key_raw)
+    else:
+        read_key_raw = raw_key
+        read_key_hash = None
+    ciphertext, nonce = encryption.encrypt_bytes(content.encode("utf-8"), read_key_raw)
+    document = Document.objects.create(
+        content_encrypted=ciphertext,
+        nonce=nonce,
+        read_key_hash=read_key_hash,
+    )
+    return str(document.id), encryption.encode_key(raw_key)
+
+
+@pytest.fixture(scope="module")
+def readonly_ws(django_db_setup, django_db_blocker, api_client):
+    """One workspace shared by the read-key rejection tests."""
+    with django_db_blocker.unblock():
+        response = api_client.post(
+            "/api/v1/workspaces",
+            {"name": "Test Workspace", "entries": []},
+            format="json"
+        )
+        return response.json()
+
 
 @pytest.mark.django_db
 class TestWorkspaces:
@@ -134,32 +183,39 @@ class TestWorkspaces:
         )
         assert response.status_code == 200
 
-    def test_read_key_cannot_update_workspace(self, api_client):
-        """Test that read key cannot update workspace."""
-        # Create workspace
-        workspace_data = {
-            "name": "Original Name",
-            "entries": []
-        }
-        create_response = api_client.post(
-            "/api/v1/workspaces",
-            workspace_data,
-            format="json"
-        )
-        ws_id = create_response.json()["id"]
-        read_key = create_response.json()["read_key"]
+    def test_conditional_get_returns_304(self, api_client, readonly_ws):
+        """Test that a matching If-None-Match short-circuits to 304.
 
-        # Try to update with read key
-        update_data = {
-            "name": "Updated Name",
-            "entries": []
-        }
-        response = api_client.put(
-            f"/api/v1/workspaces/{ws_id}",
-            update_data,
-            format="json",
-            HTTP_X_MOLT_KEY=read_key
+        A read key is enough: the conditional path only verifies the
+        key against the stored hash, it never decrypts the blob.
+        """
+        response = api_client.get(
+            f"/api/v1/workspaces/{readonly_ws['id']}",
+            HTTP_X_MOLT_KEY=readonly_ws["read_key"],
+            HTTP_IF_NONE_MATCH='"v1"'
         )
+        assert response.status_code == 304
+        assert response["ETag"] == '"v1"'
+        assert response.content == b""
+
+    @pytest.mark.parametrize("verb", ["put", "delete"])
+    def test_read_key_cannot_mutate_workspace(self, api_client, readonly_ws, verb):
+        """Test that read key cannot update or delete a workspace."""
+        ws_id = readonly_ws["id"]
+        read_key = readonly_ws["read_key"]
+
+        if verb == "put":
+            response = api_client.put(
+                f"/api/v1/workspaces/{ws_id}",
+                {"name": "Updated Name", "entries": []},
+                format="json",
+                HTTP_X_MOLT_KEY=read_key
+            )
+        else:
+            response = api_client.delete(
+                f"/api/v1/workspaces/{ws_id}",
+                HTTP_X_MOLT_KEY=read_key
+            )
         assert response.status_code == 403
 
     def test_delete_workspace(self, api_client):
@@ -191,24 +247,91 @@ class TestWorkspaces:
         )
         assert get_response.status_code == 404
 
-    def test_read_key_cannot_delete_workspace(self, api_client):
-        """Test that read key cannot delete workspace."""
-        # Create workspace
-        workspace_data = {
-            "name": "Test Workspace",
-            "entries": []
-        }
-        create_response = api_client.post(
-            "/api/v1/workspaces",
-            workspace_data,
-            format="json"
+
+@pytest.mark.django_db
+class TestWorkspacePreviews:
+    """Tests for the preview_lines entry previews on workspace reads."""
+
+    def test_previews_for_write_and_read_key_entries(
+        self, api_client, make_document
+    ):
+        """Test that both key kinds decrypt previews and sub-workspaces get names."""
+        doc1 = make_document("# Doc One\nSecond line")
+        doc2 = make_document("# Doc Two\nMore text")
+        sub_ws_id, sub_ws_key = _create_workspace(api_client, [])
+        ws_id, write_key = _create_workspace(api_client, [
+            {"type": "md", "id": doc1.id, "key": doc1.write_key},
+            {"type": "md", "id": doc2.id, "key": doc2.read_key},
+            {"type": "workspace", "id": sub_ws_id, "key": sub_ws_key},
+        ])
+
+        response = api_client.get(
+            f"/api/v1/workspaces/{ws_id}?preview_lines=1",
+            HTTP_X_MOLT_KEY=write_key
         )
-        ws_id = create_response.json()["id"]
-        read_key = create_response.json()["read_key"]
+        assert response.status_code == 200
+        entries = response.json()["entries"]
+        assert entries[0]["preview"] == "# Doc One"
+        assert entries[1]["preview"] == "# Doc Two"
+        assert entries[2]["name"] == "Preview Workspace"
 
-        # Try to delete with read key
-        response = api_client.delete(
-            f"/api/v1/workspaces/{ws_id}",
-            HTTP_X_MOLT_KEY=read_key
+    def test_preview_beyond_stored_prefix_falls_back_to_full_decrypt(
+        self, api_client, make_document
+    ):
+        """Test previews that need more lines than the 4 KB prefix holds."""
+        # First line alone nearly fills the prefix, so the second line's
+        # end lies past it and the full blob must be decrypted
+        content = "A" * 4000 + "\n" + "B" * 2000
+        doc = make_document(content)
+        ws_id, write_key = _create_workspace(
+            api_client, [{"type": "md", "id": doc.id, "key": doc.write_key}]
         )
-        assert response.status_code == 403
+
+        response = api_client.get(
+            f"/api/v1/workspaces/{ws_id}?preview_lines=2",
+            HTTP_X_MOLT_KEY=write_key
+        )
+        assert response.status_code == 200
+        assert response.json()["entries"][0]["preview"] == content
+
+    def test_preview_for_row_without_stored_prefix(self, api_client):
+        """Test that pre-migration rows (NULL preview columns) still preview."""
+        doc_id, doc_key = _legacy_document("legacy line 1\nlegacy line 2")
+        ws_id, write_key = _create_workspace(
+            api_client, [{"type": "md", "id": doc_id, "key": doc_key}]
+        )
+
+        response = api_client.get(
+            f"/api/v1/workspaces/{ws_id}?preview_lines=1",
+            HTTP_X_MOLT_KEY=write_key
+        )
+        assert response.status_code == 200
+        assert response.json()["entries"][0]["preview"] == "legacy line 1"
+
+    def test_unresolvable_entries_are_skipped(self, api_client, make_document):
+        """Test that single-key legacy, malformed-key, and wrong-key entries get no preview."""
+        single_key_id, _ = _legacy_document("single key secret", with_hash=False)
+        doc = make_document("well formed")
+        other = make_document("other document")
+        ws_id, write_key = _create_workspace(api_client, [
+            {"type": "md", "id": single_key_id, "key": encryption.encode_key(encryption.generate_raw_key())},
+            {"type": "md", "id": doc.id, "key": "not-base64!!"},
+            {"type": "md", "id": doc.id, "key": other.read_key},
+        ])
+
+        response = api_client.get(
+            f"/api/v1/workspaces/{ws_id}?preview_lines=1",
+            HTTP_X_MOLT_KEY=write_key
+        )
+        assert response.status_code == 200
+        assert all("preview" not in entry for entry in response.json()["entries"])
+
+    @pytest.mark.parametrize("value", ["0", "-1", "three"])
+    def test_invalid_preview_lines_parameter(self, api_client, readonly_ws, value):
+        """Test that non-positive or non-integer preview_lines return 400."""
+        response = api_client.get(
+            f"/api/v1/workspaces/{readonly_ws['id']}?preview_lines={value}",
+            HTTP_X_MOLT_KEY=readonly_ws["read_key"]
+        )
+        assert response.status_code == 400
+        assert response.json()["error"] == "bad_request"